@@ -21,6 +21,9 @@ logger = logging.getLogger(__name__)
 
 _ROLE_NAME = "clink"
 
+_GITHUB_URL_REGEX = re.compile(r"\bgithub\.com\b")
+_SSH_URL_REGEX = re.compile(r".*@(.*):(.*?)(?:\.git)?$")
+
 
 class CodeLinkConfig:
     """
@@ -158,37 +161,83 @@ class GithubUrlsMaker:
         The url is computed by reverse engineering Github's urls. This is prone
         to breaking.
 
-    .. todo:: Cache repositories and their url's.
+    Repositories and their normalized urls are cached by working dir, since a build
+    links to many files from the same few repositories. The head commit is read on
+    every call. The caches should be cleared at the start of each build, see
+    :meth:`~docsinfra.sphinx_utils.codelink_extension.GithubUrlsMaker.clear`.
     """
 
+    def __init__(self):
+        self._working_dirs: dict[Path, Optional[Path]] = {}
+        self._repos: dict[Path, Optional[Repo]] = {}
+        self._repo_urls: dict[Path, Optional[str]] = {}
+
+    def clear(self):
+        """
+        Clears the cached repositories and urls.
+        """
+        self._working_dirs.clear()
+        self._repos.clear()
+        self._repo_urls.clear()
+
+    def get_working_dir(self, directory: Path) -> Optional[Path]:
+        """
+        :return: the closest directory containing ``.git``, starting from the given
+            directory and going up
+        """
+        if directory not in self._working_dirs:
+            self._working_dirs[directory] = next(
+                (
+                    candidate
+                    for candidate in (directory, *directory.parents)
+                    if (candidate / ".git").exists()
+                ),
+                None,
+            )
+        return self._working_dirs[directory]
+
     def get_repo(self, path: Path) -> Optional[Repo]:
         """
         :return: the path's repository
         """
-        try:
-            return Repo(path, search_parent_directories=True)
-        except InvalidGitRepositoryError:
+        working_dir = self.get_working_dir(path if path.is_dir() else path.parent)
+        if working_dir is None:
             return None
 
+        if working_dir not in self._repos:
+            try:
+                repo = Repo(working_dir)
+            except InvalidGitRepositoryError:
+                repo = None
+            self._repos[working_dir] = repo
+        return self._repos[working_dir]
+
     def is_github_url(self, url: str) -> bool:
         """
         Returns whether the given url is in Github.com.
         """
-        return re.search(r"\bgithub\.com\b", url) is not None
+        return _GITHUB_URL_REGEX.search(url) is not None
 
-    def normalize_url(self, url: str) -> str:
+    def normalize_url(self, url: str) -> Optional[str]:
         """
-        Convert remote repo urls to ``https://`` urls. For example:
+        Convert remote repo urls to ``https://`` urls, returns None if the url is not
+        recognized. For example:
 
         >>> GithubUrlsMaker().normalize_url('git@github.com:Certora/docs-infrastructure.git')
         'https://github.com/Certora/docs-infrastructure/'
 
+        >>> GithubUrlsMaker().normalize_url('git@github.com:Certora/Examples')
+        'https://github.com/Certora/Examples/'
+
         >>> GithubUrlsMaker().normalize_url('https://github.com/Certora/Examples.git')
         'https://github.com/Certora/Examples/'
         """
         if not url.startswith("https://"):
             # Replace ssh access with https
-            username, site, rel = re.match(r"(.*)@(.*):(.*).git", url).groups()
+            match = _SSH_URL_REGEX.match(url)
+            if match is None:
+                return None
+            site, rel = match.groups()
             url = f"https://{site}/{rel}"
 
         if url.endswith(".git"):
@@ -209,12 +258,10 @@ class GithubUrlsMaker:
             logger.warning(f"no git repo found in {path} - cannot create Github url")
             return None
 
-        url = repo.remote().url
-        if not self.is_github_url(url):
-            logger.warning(f"repo {repo} is not on Github - cannot create Github url")
+        url = self.get_repo_url(repo)
+        if url is None:
             return None
 
-        url = self.normalize_url(url)
         rel_path = path.relative_to(repo.working_dir)
         relative_parts = [
             "tree" if path.is_dir() else "blob",
@@ -224,6 +271,29 @@ class GithubUrlsMaker:
         relative = "/".join(relative_parts)
         return url + relative
 
+    def get_repo_url(self, repo: Repo) -> Optional[str]:
+        """
+        :return: the repository's normalized Github url, or None if the repository is
+            not on Github
+        """
+        key = Path(repo.working_dir)
+        if key not in self._repo_urls:
+            url = repo.remote().url
+            if not self.is_github_url(url):
+                logger.warning(
+                    f"repo {repo} is not on Github - cannot create Github url"
+                )
+                self._repo_urls[key] = None
+            else:
+                normalized = self.normalize_url(url)
+                if normalized is None:
+                    logger.warning(
+                        f"unrecognized remote url {url} of repo {repo} - "
+                        "cannot create Github url"
+                    )
+                self._repo_urls[key] = normalized
+        return self._repo_urls[key]
+
 
 GITHUB_URL_MAKER = GithubUrlsMaker()
 
@@ -299,7 +369,18 @@ class TutorialsCodeLink(XRefRole):
         return [ref], warnings
 
 
+def _clear_github_urls_cache(app: Sphinx):
+    GITHUB_URL_MAKER.clear()
+
+
 def setup(app: Sphinx) -> dict[str, Any]:
     app.add_role(_ROLE_NAME, TutorialsCodeLink())
     CodeLinkConfig.add_config_values(app)
-    return {"version": "0.1", "parallel_read_safe": False}
+    app.connect("builder-inited", _clear_github_urls_cache)
+    # Parallel safe: the role keeps no environment data, and the Github urls caches
+    # are cleared on builder-inited, before parallel readers are forked
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
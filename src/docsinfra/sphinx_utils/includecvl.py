@@ -2,10 +2,13 @@
 A Sphinx extension which adds a Sphinx directive for including CVL snippets from
 spec files.
 """
+import os
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
-from cvldoc_parser import CvlElement, parse
 from docutils import nodes
 from docutils.nodes import Element, Node
 from docutils.parsers.rst import directives
@@ -17,6 +20,9 @@ from sphinx.util import logging, parselinenos
 
 from .codelink_extension import CodeLinkConfig
 
+if TYPE_CHECKING:
+    from cvldoc_parser import CvlElement
+
 logger = logging.getLogger(__name__)
 
 _INVALID_OPTIONS_PAIR = LiteralIncludeReader.INVALID_OPTIONS_PAIR + [
@@ -24,6 +30,75 @@ _INVALID_OPTIONS_PAIR = LiteralIncludeReader.INVALID_OPTIONS_PAIR + [
     ("pyobject", "cvlobject"),
 ]
 
+_LINENOS_OPTIONS = frozenset({"linenos", "lineno-start", "lineno-match"})
+
+
+_METHODS = "methods"
+
+
+def _get_cvlelement_name(cvlelement: "CvlElement") -> str:
+    """
+    :return: the name of the element, or ``"methods"`` if this element is the
+        methods block
+    """
+    name = cvlelement.ast.name
+    if name is None and cvlelement.ast.kind == _METHODS:
+        # The methods block
+        name = _METHODS
+    return name
+
+
+@lru_cache(maxsize=128)
+def _index_spec(
+    filename: str, mtime_ns: int
+) -> tuple[Mapping[str, str], frozenset[str]]:
+    """
+    Parses a single spec file using CVLDoc and indexes its elements by name. The same
+    spec file is usually included by many directives, so the result is cached. The
+    file's modification time is part of the key so that edited files are parsed again.
+
+    :return: a mapping from element name to the element's raw text, and the set of
+        names shared by several elements
+    """
+    # Imported here since it is only needed by directives using ``cvlobject``
+    from cvldoc_parser import parse
+
+    try:
+        # TODO: Since `parse` only accepts filenames, we reread the file.
+        # Should fix this hack once `cvldoc_parser.parse` accepts strings.
+        parsed = parse([filename])
+    except ValueError:
+        raise ValueError(f"CVLDoc failed to parse {filename}")
+
+    parsed = parsed[0]  # only a single file was parsed
+    if len(parsed) == 0:
+        raise ValueError(f"CVLDoc returned no elements for {filename}")
+
+    by_name: dict[str, str] = {}
+    duplicates: set[str] = set()
+    for cvlelement in parsed:
+        name = _get_cvlelement_name(cvlelement)
+        if name in by_name:
+            duplicates.add(name)
+        by_name[name] = cvlelement.raw()
+    return MappingProxyType(by_name), frozenset(duplicates)
+
+
+@lru_cache(maxsize=128)
+def _read_lines(
+    filename: str, mtime_ns: int, encoding: str, tab_width: int | None
+) -> tuple[str, ...]:
+    """
+    Reads the file lines the same way as
+    :meth:`sphinx.directives.code.LiteralIncludeReader.read_file`, but cached since
+    the same file is usually included by many directives.
+    """
+    with open(filename, encoding=encoding, errors="strict") as f:
+        text = f.read()
+    if tab_width is not None:
+        text = text.expandtabs(tab_width)
+    return tuple(text.splitlines(True))
+
 
 # TODO: Enable replacing some lines by ellipsis
 # TODO: Hooks are currently ignored by cvldoc_parser, once fixed enable extracting them
@@ -33,12 +108,13 @@ class CVLIncludeReader(LiteralIncludeReader):
     extract CVL elements in spec files by name.
 
     * By default, the language used is CVL.
+    * The ``spacing`` option is the number of empty lines between CVL elements.
     * Currently does *not* support both ``diff`` together with ``cvlobject``
       (for showing the diff for a particular object).
     """
 
     INVALID_OPTIONS_PAIR = _INVALID_OPTIONS_PAIR
-    METHODS = "methods"
+    METHODS = _METHODS
     SPACING = "spacing"
     _default_spacing = 1  # Single line spacing between elements
 
@@ -56,79 +132,85 @@ class CVLIncludeReader(LiteralIncludeReader):
                 self.prepend_filter,
                 self.append_filter,
             ]
-            lines = self.read_file(self.filename, location=location)
+            if self.options.get("cvlobject"):
+                # The file lines are replaced by the CVL elements, no need to read them
+                lines = []
+            else:
+                lines = self.read_file(self.filename, location=location)
             for func in filters:
                 lines = func(lines, location=location)
 
         return "".join(lines), len(lines)
 
-    def _get_cvlelement_name(self, cvlelement: CvlElement) -> str:
+    def read_file(
+        self, filename: str, location: tuple[str, int] | None = None
+    ) -> list[str]:
         """
-        :return: the name of the element, or ``self.METHODS`` if this element is the
-            methods block
+        Returns the file lines using a cache keyed by the file's modification time.
+        A new list is returned, since some filters modify the lines in place.
         """
-        name = cvlelement.ast.name
-        if name is None and cvlelement.ast.kind == self.METHODS:
-            # The methods block
-            name = self.METHODS
-        return name
+        try:
+            mtime_ns = os.stat(filename).st_mtime_ns
+            tab_width = self.options.get("tab-width")
+            lines = _read_lines(filename, mtime_ns, self.encoding, tab_width)
+        except (OSError, UnicodeError):
+            # Let the base class raise the appropriate error
+            return super().read_file(filename, location=location)
+        return list(lines)
 
     def cvlobject_filter(
         self, lines: list[str], location: tuple[str, int] | None = None
     ) -> list[str]:
-        cvlobjects = self.options.get("cvlobject")
-        spacing_lines = self.options.get(self.SPACING, self._default_spacing) + 1
+        options = self.options
+        cvlobjects = options.get("cvlobject")
 
         # Set the language
-        if self.options.get("language") is None:
-            self.options["language"] = "cvl"
+        if options.get("language") is None:
+            options["language"] = "cvl"
 
         if cvlobjects:
             try:
-                # TODO: Since `parse` only accepts filenames, we reread the file.
-                # Should fix this hack once `cvldoc_parser.parse` accepts strings.
-                parsed = parse([self.filename])
-            except ValueError:
-                raise ValueError(f"CVLDoc failed to parse {self.filename}")
-
-            parsed = parsed[0]  # only a single file was parsed
-            if len(parsed) == 0:
-                raise ValueError(f"CVLDoc returned no elements for {self.filename}")
+                mtime_ns = os.stat(self.filename).st_mtime_ns
+            except OSError as exc:
+                raise OSError(
+                    __("Include file %r not found or reading it failed") % self.filename
+                ) from exc
+            by_name, duplicates = _index_spec(self.filename, mtime_ns)
 
             cvlobjects = cvlobjects.split()  # Accept a list of cvl objects
-            cvls = dict.fromkeys(cvlobjects)  # Keep the order
-
-            for cvlelement in parsed:
-                name = self._get_cvlelement_name(cvlelement)
-                if name in cvls:
-                    if cvls[name] is not None:
-                        raise ValueError(
-                            f"Found two elements matching {name} in {self.filename}"
-                        )
-                    cvls[name] = cvlelement.raw()
-
-            # Warn about missing elements
-            for name, element in cvls.items():
-                if element is None:
+
+            cvls = []
+            for name in dict.fromkeys(cvlobjects):  # Keep the order, drop repeats
+                if name in duplicates:
+                    raise ValueError(
+                        f"Found two elements matching {name} in {self.filename}"
+                    )
+                raw = by_name.get(name)
+                if raw is None:
                     logger.warning(
                         __("failed to find CVL element matching %s in %s")
                         % (name, self.filename),
                         location=location,
                     )
-
-            # Remove missing elements
-            cvls = {name: el for name, el in cvls.items() if el is not None}
-
-            spacing = "\n" * spacing_lines
-            text = spacing.join(cvls.values())
-            lines = text.splitlines(True)
+                else:
+                    cvls.append(raw)
+
+            # The spacing is a line break ending the element's last line, followed by
+            # the empty lines. Each element is split together with the spacing after
+            # it, so every piece ends with a line break and no joined text is needed.
+            spacing = "\n" * (options.get(self.SPACING, self._default_spacing) + 1)
+            lines = []
+            for raw in cvls[:-1]:
+                lines.extend((raw + spacing).splitlines(True))
+            if cvls:
+                lines.extend(cvls[-1].splitlines(True))
         return lines
 
 
 # Extend the option_spec with new options
 _extended_option_spec = dict(LiteralInclude.option_spec)
 _extended_option_spec["cvlobject"] = directives.unchanged_required
-_extended_option_spec[CVLIncludeReader.SPACING] = int
+_extended_option_spec[CVLIncludeReader.SPACING] = directives.nonnegative_int
 
 
 class CVLInclude(LiteralInclude):
@@ -138,8 +220,8 @@ class CVLInclude(LiteralInclude):
     #. Enables including CVL elements by name. To include cvl elements by name use the
        ``cvlobject`` option and provide a list of CVL elements names, separated by
        spaces. To include the methods block use ``methods``.
-       Also adds the ``spacing`` option which determines the number of lines between CVL
-       elements.
+       Also adds the ``spacing`` option which determines the number of empty lines
+       between CVL elements.
     #. Automatically determines the language for certain file extensions using the
        :attr:`~docsinfra.sphinx_utils.includecvl.CVLInclude.file_suffix_to_language`
        class variable.
@@ -168,10 +250,15 @@ class CVLInclude(LiteralInclude):
             return [
                 document.reporter.warning("File insertion disabled", line=self.lineno)
             ]
+        options = self.options
+        has_diff = "diff" in options
+        caption = options.get("caption")
+        emphasize_lines = options.get("emphasize-lines")
+
         # convert options['diff'] to absolute path
-        if "diff" in self.options:
-            _, path = self.env.relfn2path(self.options["diff"])
-            self.options["diff"] = path
+        if has_diff:
+            _, path = self.env.relfn2path(options["diff"])
+            options["diff"] = path
 
         try:
             location = self.state_machine.get_source_and_line(self.lineno)
@@ -182,44 +269,41 @@ class CVLInclude(LiteralInclude):
             self.env.note_dependency(rel_filename)
 
             # Set language based on extension
-            if ("language" not in self.options) and ("diff" not in self.options):
+            if ("language" not in options) and not has_diff:
                 suffix = Path(filename).suffix
                 if suffix in self.file_suffix_to_language:
-                    self.options["language"] = self.file_suffix_to_language[suffix]
+                    options["language"] = self.file_suffix_to_language[suffix]
 
-            reader = CVLIncludeReader(filename, self.options, self.config)
+            reader = CVLIncludeReader(filename, options, self.config)
             text, lines = reader.read(location=location)
 
             retnode: Element = nodes.literal_block(text, text, source=filename)
-            retnode["force"] = "force" in self.options
+            retnode["force"] = "force" in options
             self.set_source_info(retnode)
-            if self.options.get("diff"):  # if diff is set, set udiff
+            if has_diff:  # if diff is set, set udiff
                 retnode["language"] = "udiff"
-            elif "language" in self.options:
-                retnode["language"] = self.options["language"]
-            if (
-                "linenos" in self.options
-                or "lineno-start" in self.options
-                or "lineno-match" in self.options
-            ):
+            elif "language" in options:
+                # NOTE: The reader may set the language, so this is read afterwards
+                retnode["language"] = options["language"]
+            if not _LINENOS_OPTIONS.isdisjoint(options):
                 retnode["linenos"] = True
-            retnode["classes"] += self.options.get("class", [])
+            retnode["classes"] += options.get("class", [])
             extra_args = retnode["highlight_args"] = {}
-            if "emphasize-lines" in self.options:
-                hl_lines = parselinenos(self.options["emphasize-lines"], lines)
-                if any(i >= lines for i in hl_lines):
+            if emphasize_lines is not None:
+                hl_lines = parselinenos(emphasize_lines, lines)
+                in_range = [x + 1 for x in hl_lines if x < lines]
+                if len(in_range) < len(hl_lines):
                     logger.warning(
                         __("line number spec is out of range(1-%d): %r")
-                        % (lines, self.options["emphasize-lines"]),
+                        % (lines, emphasize_lines),
                         location=location,
                     )
-                extra_args["hl_lines"] = [x + 1 for x in hl_lines if x < lines]
+                extra_args["hl_lines"] = in_range
             extra_args["linenostart"] = reader.lineno_start
 
-            if "caption" in self.options:
-                caption = self.options["caption"]
+            if caption is not None:
                 # Use default caption if caption is empty
-                if caption is None or len(caption) == 0:
+                if not caption:
                     caption = self._default_caption()
                 retnode = container_wrapper(self, retnode, caption)
 